@@ -2,9 +2,14 @@
 Custom authentication backend for phone-based authentication.
 """
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
 
 from .models import User
 
+# Verified against when the phone number is unknown, so both branches of
+# PhoneAuthBackend.authenticate run exactly one hasher verify.
+_DUMMY_HASH = make_password("dummy")
+
 
 class PhoneAuthBackend(ModelBackend):
     """
@@ -21,7 +26,7 @@ class PhoneAuthBackend(ModelBackend):
         except User.DoesNotExist:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a non-existing user
-            User().set_password(password)
+            check_password(password, _DUMMY_HASH)
             return None
         else:
             if user.check_password(password) and self.user_can_authenticate(user):
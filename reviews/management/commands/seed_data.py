@@ -1,6 +1,7 @@
 import random
 from datetime import timedelta
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
@@ -13,17 +14,19 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         random.seed(42)
 
-        users = []
-        for i in range(10):
-            phone = f"900000000{i}"
-            user, created = User.objects.get_or_create(
-                phone=phone,
-                defaults={"name": f"User {i}", "password": "password123"},
-            )
-            if created:
-                user.set_password("password123")
-                user.save()
-            users.append(user)
+        # Hash once; every sample user shares the same password
+        password = make_password("password123")
+        phones = [f"900000000{i}" for i in range(10)]
+        User.objects.bulk_create(
+            [
+                User(phone=phone, name=f"User {i}", password=password)
+                for i, phone in enumerate(phones)
+            ],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts doesn't set primary keys, so read the rows back
+        users_by_phone = User.objects.in_bulk(phones, field_name="phone")
+        users = [users_by_phone[phone] for phone in phones]
 
         place_specs = [
             ("Star Cafe", "MG Road, Bangalore", "restaurant"),
@@ -33,14 +36,20 @@ class Command(BaseCommand):
             ("Tasty Bites", "Koramangala, Bangalore", "restaurant"),
         ]
 
-        places = []
-        for name, address, category in place_specs:
-            place, _ = Place.objects.get_or_create(
-                name=name,
-                address=address,
-                defaults={"category": category},
+        Place.objects.bulk_create(
+            [
+                Place(name=name, address=address, category=category)
+                for name, address, category in place_specs
+            ],
+            ignore_conflicts=True,
+        )
+        places_by_key = {
+            (place.name, place.address): place
+            for place in Place.objects.filter(
+                name__in=[name for name, _, _ in place_specs]
             )
-            places.append(place)
+        }
+        places = [places_by_key[(name, address)] for name, address, _ in place_specs]
 
         review_texts = [
             "Great service and friendly staff.",
@@ -50,25 +59,41 @@ class Command(BaseCommand):
             "Good value for money.",
         ]
 
+        # Review has no unique constraint, so skip pairs seeded by an earlier run
+        existing = set(
+            Review.objects.filter(place__in=places, user__in=users).values_list(
+                "place_id", "user_id"
+            )
+        )
+        now = timezone.now()
+        reviews = []
         for place in places:
             for user in users:
                 if random.random() < 0.7:
                     rating = random.randint(1, 5)
                     text = random.choice(review_texts)
                     days_ago = random.randint(0, 60)
-                    review, created = Review.objects.get_or_create(
-                        place=place,
-                        user=user,
-                        defaults={
-                            "rating": rating,
-                            "text": text,
-                        },
+                    if (place.id, user.id) in existing:
+                        continue
+                    reviews.append(
+                        Review(
+                            place=place,
+                            user=user,
+                            rating=rating,
+                            text=text,
+                            created_at=now - timedelta(days=days_ago),
+                        )
                     )
-                    # Update created_at to simulate older reviews
-                    if days_ago > 0:
-                        review.created_at = timezone.now() - timedelta(days=days_ago)
-                        review.save(update_fields=["created_at"])
-
-        self.stdout.write(self.style.SUCCESS("Sample data populated successfully."))
 
+        # created_at is auto_now_add, which bulk_create overwrites, so write
+        # the simulated older timestamps back in a single bulk_update
+        created_at = [review.created_at for review in reviews]
+        Review.objects.bulk_create(reviews)
+        for review, value in zip(reviews, created_at):
+            review.created_at = value
+        Review.objects.bulk_update(reviews, ["created_at"])
+        # bulk_create doesn't send post_save, so refresh the rating stats here
+        Place.objects.filter(pk__in=[place.pk for place in places]).update_rating_stats()
+        Place.bump_search_version()
 
+        self.stdout.write(self.style.SUCCESS("Sample data populated successfully."))
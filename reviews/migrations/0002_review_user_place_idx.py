@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'place'], name='review_user_place_idx'),
+        ),
+    ]
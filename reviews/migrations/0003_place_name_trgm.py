@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-15 21:10
+
+from django.db import migrations
+
+# SearchPlacesView filters with name__icontains, which PostgreSQL runs as
+# UPPER("name"::text) LIKE UPPER('%...%'). A B-tree index can't serve a
+# leading wildcard, but a pg_trgm GIN index over the same expression can.
+# Other backends (SQLite in development) have no trigram support, so the
+# index is only created on PostgreSQL.
+
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    'CREATE INDEX IF NOT EXISTS place_name_trgm ON reviews_place '
+    'USING gin (UPPER("name"::text) gin_trgm_ops)',
+]
+DROP_SQL = ["DROP INDEX IF EXISTS place_name_trgm"]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_user_place_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run_on_postgresql(CREATE_SQL),
+            _run_on_postgresql(DROP_SQL),
+        ),
+    ]
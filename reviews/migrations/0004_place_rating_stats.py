@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-15 21:04
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Place = apps.get_model("reviews", "Place")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(place=models.OuterRef("pk")).values("place")
+    Place.objects.update(
+        avg_rating=Coalesce(
+            models.Subquery(reviews.annotate(avg=models.Avg("rating")).values("avg")),
+            models.Value(0.0),
+            output_field=models.FloatField(),
+        ),
+        review_count=Coalesce(
+            models.Subquery(reviews.annotate(count=models.Count("pk")).values("count")),
+            models.Value(0),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_place_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='avg_rating',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
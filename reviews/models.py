@@ -1,7 +1,12 @@
+import uuid
+
+from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 
 
 class UserManager(BaseUserManager):
@@ -49,7 +54,36 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.name} ({self.phone})"
 
 
+class PlaceQuerySet(models.QuerySet):
+    def update_rating_stats(self):
+        """
+        Recompute the denormalized avg_rating/review_count columns from the
+        reviews table in a single UPDATE.
+
+        The place rows are locked first (in pk order, to avoid deadlocks), so
+        concurrent writers recompute one after another and the later UPDATE
+        sees every review committed before it, instead of overwriting the
+        stats with a snapshot that misses one.
+        """
+        reviews = Review.objects.filter(place=models.OuterRef("pk")).values("place")
+        with transaction.atomic(using=self.db):
+            list(self.select_for_update().order_by("pk").values_list("pk", flat=True))
+            return self.update(
+                avg_rating=Coalesce(
+                    models.Subquery(reviews.annotate(avg=models.Avg("rating")).values("avg")),
+                    models.Value(0.0),
+                    output_field=models.FloatField(),
+                ),
+                review_count=Coalesce(
+                    models.Subquery(reviews.annotate(count=models.Count("pk")).values("count")),
+                    models.Value(0),
+                ),
+            )
+
+
 class Place(models.Model):
+    SEARCH_VERSION_CACHE_KEY = "places:search-version"
+
     CATEGORY_CHOICES = [
         ("shop", "Shop"),
         ("doctor", "Doctor"),
@@ -62,6 +96,11 @@ class Place(models.Model):
     category = models.CharField(
         max_length=20, choices=CATEGORY_CHOICES, default="other", blank=True
     )
+    # Denormalized from Review, kept current by reviews.signals
+    avg_rating = models.FloatField(default=0.0)
+    review_count = models.PositiveIntegerField(default=0)
+
+    objects = PlaceQuerySet.as_manager()
 
     class Meta:
         constraints = [
@@ -74,6 +113,30 @@ class Place(models.Model):
     def __str__(self):
         return f"{self.name} - {self.address[:50]}"
 
+    @classmethod
+    def search_version(cls):
+        """
+        Opaque token that changes whenever a place or review is written.
+
+        It is random rather than a counter, so a cleared or restarted cache
+        can never hand out a token that matches an ETag from before the reset.
+        A process that misses another's bump (an unshared cache) serves a
+        stale token for at most PLACE_SEARCH_VERSION_TIMEOUT seconds.
+        """
+        return cache.get_or_set(
+            cls.SEARCH_VERSION_CACHE_KEY,
+            lambda: uuid.uuid4().hex,
+            cls._search_version_timeout(),
+        )
+
+    @classmethod
+    def bump_search_version(cls):
+        cache.set(cls.SEARCH_VERSION_CACHE_KEY, uuid.uuid4().hex, cls._search_version_timeout())
+
+    @staticmethod
+    def _search_version_timeout():
+        return getattr(settings, "PLACE_SEARCH_VERSION_TIMEOUT", 60)
+
 
 class Review(models.Model):
     place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name="reviews")
@@ -88,6 +151,7 @@ class Review(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["place", "-created_at"]),
+            models.Index(fields=["user", "place"], name="review_user_place_idx"),
         ]
 
     def __str__(self):
@@ -0,0 +1,29 @@
+"""
+JSON renderer backed by orjson.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer that encodes with orjson.
+
+    Serializer output is already plain dicts/lists of primitives, so anything
+    orjson doesn't handle natively (lazy translation strings, Decimal, ...)
+    falls back to str(). Non-string keys (e.g. the int-keyed errors of a
+    ListField) are allowed, as with the stdlib encoder.
+
+    orjson only supports two-space indentation, so any requested indent
+    (``Accept: application/json; indent=4`` or the browsable API) renders
+    with two spaces.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=str, option=option)
@@ -32,14 +32,11 @@ class LoginSerializer(serializers.Serializer):
 
 
 class PlaceSerializer(serializers.ModelSerializer):
-    average_rating = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(source="avg_rating", read_only=True)
 
     class Meta:
         model = Place
         fields = ["id", "name", "address", "category", "average_rating"]
-    
-    def get_average_rating(self, obj):
-        return obj.average_rating if obj.average_rating is not None else 0.0
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -50,18 +47,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ["id", "rating", "text", "user_name", "created_at"]
 
 
-class PlaceDetailSerializer(serializers.ModelSerializer):
-    average_rating = serializers.SerializerMethodField()
-    reviews = ReviewSerializer(many=True, read_only=True)
-
-    class Meta:
-        model = Place
-        fields = ["id", "name", "address", "category", "average_rating", "reviews"]
-    
-    def get_average_rating(self, obj):
-        return obj.average_rating if obj.average_rating is not None else 0.0
-
-
 class AddReviewSerializer(serializers.Serializer):
     place_name = serializers.CharField()
     place_address = serializers.CharField()
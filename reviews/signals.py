@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Place, Review
+
+
+@receiver(post_init, sender=Review)
+def remember_review_place(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred place_id doesn't trigger a query
+    instance._saved_place_id = instance.__dict__.get("place_id")
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_place_rating_stats(sender, instance, origin=None, **kwargs):
+    # A review moved to another place also changes the stats of the old one
+    place_ids = {instance.place_id, instance._saved_place_id} - {None}
+    instance._saved_place_id = instance.place_id
+    if origin is None or origin is instance:
+        Place.objects.filter(pk__in=place_ids).update_rating_stats()
+    elif not (isinstance(origin, Place) or getattr(origin, "model", None) is Place):
+        # A cascade (e.g. a deleted user) or a queryset delete sends this once
+        # per review; collect the places and recompute them once on commit.
+        # Reviews of a place that is itself being deleted need nothing.
+        pending = getattr(origin, "_review_place_ids", None)
+        if pending is None:
+            pending = origin._review_place_ids = set()
+            transaction.on_commit(
+                lambda: Place.objects.filter(pk__in=pending).update_rating_stats()
+            )
+        pending.update(place_ids)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+def bump_search_version(sender, **kwargs):
+    # After commit, so a search can't pair the new version with old rows
+    transaction.on_commit(Place.bump_search_version)
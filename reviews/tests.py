@@ -1,3 +1,296 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .models import Place, Review, User
+from .renderers import ORJSONRenderer
+
+
+class JWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone="9000000000", name="Me", password="secret123")
+
+    def login(self):
+        response = self.client.post(
+            reverse("login"), {"phone": "9000000000", "password": "secret123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_login_returns_a_token_pair(self):
+        tokens = self.login()
+
+        self.assertEqual(set(tokens), {"access", "refresh"})
+
+    def test_access_token_authenticates_requests(self):
+        access = self.login()["access"]
+        url = reverse("search-places")
+
+        self.assertEqual(self.client.get(url).status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_token_issues_a_new_access_token(self):
+        refresh = self.login()["refresh"]
+
+        response = self.client.post(reverse("token-refresh"), {"refresh": refresh}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        access = response.data["access"]
+        response = self.client.get(reverse("search-places"), HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, 200)
+
+
+class PlaceDetailViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone="9000000000", name="Me", password="secret123")
+        self.other = User.objects.create_user(phone="9000000001", name="Other", password="secret123")
+        self.place = Place.objects.create(name="Star Cafe", address="MG Road")
+        self.client.force_authenticate(self.user)
+
+    def test_reviews_are_nested_in_a_paginated_envelope(self):
+        Review.objects.create(place=self.place, user=self.other, rating=4)
+        mine = Review.objects.create(place=self.place, user=self.user, rating=5)
+        Review.objects.create(place=self.place, user=self.other, rating=3)
+
+        url = reverse("place-detail", args=[self.place.pk])
+        response = self.client.get(url, {"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["average_rating"], 4.0)
+        reviews = response.data["reviews"]
+        self.assertEqual(reviews["count"], 3)
+        self.assertIsNone(reviews["previous"])
+        self.assertIn("offset=2", reviews["next"])
+        self.assertEqual(len(reviews["results"]), 2)
+        self.assertEqual(reviews["results"][0]["id"], mine.pk)
+
+
+class PlaceRatingStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone="9000000000", name="Me", password="secret123")
+        self.place = Place.objects.create(name="Star Cafe", address="MG Road")
+
+    def assertStats(self, place, avg_rating, review_count):
+        place.refresh_from_db()
+        self.assertEqual(place.avg_rating, avg_rating)
+        self.assertEqual(place.review_count, review_count)
+
+    def test_saving_reviews_updates_stats(self):
+        Review.objects.create(place=self.place, user=self.user, rating=5)
+        review = Review.objects.create(place=self.place, user=self.user, rating=2)
+        self.assertStats(self.place, 3.5, 2)
+
+        review.rating = 4
+        review.save()
+        self.assertStats(self.place, 4.5, 2)
+
+    def test_deleting_reviews_updates_stats(self):
+        first = Review.objects.create(place=self.place, user=self.user, rating=5)
+        second = Review.objects.create(place=self.place, user=self.user, rating=2)
+
+        first.delete()
+        self.assertStats(self.place, 2.0, 1)
+        second.delete()
+        self.assertStats(self.place, 0.0, 0)
+
+    def test_moving_a_review_updates_both_places(self):
+        other = Place.objects.create(name="Book World", address="Brigade Road")
+        Review.objects.create(place=self.place, user=self.user, rating=5)
+        review = Review.objects.create(place=self.place, user=self.user, rating=1)
+
+        review = Review.objects.get(pk=review.pk)
+        review.place = other
+        review.save()
+
+        self.assertStats(self.place, 5.0, 1)
+        self.assertStats(other, 1.0, 1)
+
+    def test_deleting_a_place_skips_recomputing_its_stats(self):
+        Review.objects.bulk_create(
+            Review(place=self.place, user=self.user, rating=4) for _ in range(30)
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.place.delete()
+
+        self.assertLess(len(ctx.captured_queries), 10)
+        self.assertFalse(Review.objects.exists())
+
+    def test_deleting_a_user_recomputes_each_place_once(self):
+        other = Place.objects.create(name="Book World", address="Brigade Road")
+        someone = User.objects.create_user(phone="9000000001", name="Other", password="secret123")
+        Review.objects.create(place=self.place, user=someone, rating=2)
+        for place in [self.place, other] * 10:
+            Review.objects.create(place=place, user=self.user, rating=5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.delete()
+
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "reviews_place"')]
+        self.assertEqual(len(updates), 1)
+        self.assertStats(self.place, 2.0, 1)
+        self.assertStats(other, 0.0, 0)
+
+
+class RatingStatsBackfillMigrationTests(TransactionTestCase):
+    migrate_from = [("reviews", "0003_place_name_trgm")]
+    migrate_to = [("reviews", "0004_place_rating_stats")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfills_existing_reviews(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        user = apps.get_model("reviews", "User").objects.create(phone="9000000000", name="Me")
+        Place = apps.get_model("reviews", "Place")
+        Review = apps.get_model("reviews", "Review")
+        reviewed = Place.objects.create(name="Star Cafe", address="MG Road")
+        unreviewed = Place.objects.create(name="Book World", address="Brigade Road")
+        Review.objects.create(place=reviewed, user=user, rating=4)
+        Review.objects.create(place=reviewed, user=user, rating=1)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+        Place = executor.loader.project_state(self.migrate_to).apps.get_model("reviews", "Place")
+
+        reviewed = Place.objects.get(pk=reviewed.pk)
+        self.assertEqual((reviewed.avg_rating, reviewed.review_count), (2.5, 2))
+        unreviewed = Place.objects.get(pk=unreviewed.pk)
+        self.assertEqual((unreviewed.avg_rating, unreviewed.review_count), (0.0, 0))
+
+
+class ORJSONRendererTests(TestCase):
+    def test_renders_non_string_keys(self):
+        # Shape of a ListField child validation error
+        data = {"tags": {0: ["Not a valid string."]}}
+        self.assertEqual(
+            ORJSONRenderer().render(data),
+            b'{"tags":{"0":["Not a valid string."]}}',
+        )
+
+    def test_honors_requested_indent(self):
+        renderer = ORJSONRenderer()
+        self.assertEqual(
+            renderer.render({"a": 1}, "application/json; indent=4"),
+            b'{\n  "a": 1\n}',
+        )
+        self.assertEqual(
+            renderer.render({"a": 1}, "application/json", {"indent": 4}),
+            b'{\n  "a": 1\n}',
+        )
+        self.assertEqual(renderer.render({"a": 1}, "application/json"), b'{"a":1}')
+
+
+class AddReviewViewTests(APITestCase):
+    url = reverse("add-review")
+
+    def setUp(self):
+        self.user = User.objects.create_user(phone="9000000000", name="Me", password="secret123")
+        self.client.force_authenticate(self.user)
+
+    def add_review(self, name, address, rating=5, **extra):
+        return self.client.post(
+            self.url,
+            {"place_name": name, "place_address": address, "rating": rating, **extra},
+            format="json",
+        )
+
+    def test_upsert_creates_a_new_place(self):
+        response = self.add_review("Star Cafe", "MG Road", category="restaurant")
+
+        self.assertEqual(response.status_code, 201)
+        place = Place.objects.get(name="Star Cafe", address="MG Road")
+        self.assertEqual(place.category, "restaurant")
+        self.assertEqual(Review.objects.get().place, place)
+
+    def test_upsert_reuses_an_existing_place(self):
+        place = Place.objects.create(name="Star Cafe", address="MG Road", category="restaurant")
+
+        response = self.add_review("Star Cafe", "MG Road", category="shop")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Place.objects.count(), 1)
+        place.refresh_from_db()
+        self.assertEqual(place.category, "restaurant")
+        self.assertEqual((place.review_count, place.avg_rating), (1, 5.0))
+        self.assertEqual(Review.objects.get().place, place)
+
+    def test_upsert_without_returned_pk_looks_the_place_up(self):
+        place = Place.objects.create(name="Star Cafe", address="MG Road")
+
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            response = self.add_review("Star Cafe", "MG Road")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Review.objects.get().place, place)
+
+    def test_renamed_place_is_not_reused_for_its_old_name(self):
+        self.assertEqual(self.add_review("Star Cafe", "MG Road").status_code, 201)
+        Place.objects.filter(name="Star Cafe").update(name="Moon Cafe")
+
+        self.assertEqual(self.add_review("Star Cafe", "MG Road").status_code, 201)
+
+        self.assertEqual(Place.objects.get(name="Moon Cafe").reviews.count(), 1)
+        self.assertEqual(Place.objects.get(name="Star Cafe").reviews.count(), 1)
+
+
+class SearchPlacesETagTests(APITestCase):
+    url = reverse("search-places")
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone="9000000000", name="Me", password="secret123")
+        self.place = Place.objects.create(name="Star Cafe", address="MG Road")
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_results_return_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(place=self.place, user=self.user, rating=5)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(PLACE_SEARCH_VERSION_TIMEOUT=60)
+    def test_version_expires_without_a_shared_cache(self):
+        # Stands in for a write made by another process with its own cache
+        etag = self.client.get(self.url)["ETag"]
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_media_type(self):
+        json_etag = self.client.get(self.url, HTTP_ACCEPT="application/json")["ETag"]
+        html = self.client.get(self.url, HTTP_ACCEPT="text/html", HTTP_IF_NONE_MATCH=json_etag)
+
+        self.assertEqual(html.status_code, 200)
+        self.assertNotEqual(html["ETag"], json_etag)
@@ -1,20 +1,39 @@
-from django.db.models import Avg, Case, IntegerField, Q, When
+import hashlib
+import json
+
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, When
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 from rest_framework import generics, permissions, status
-from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import Place, Review
 from .serializers import (
     AddReviewSerializer,
     LoginSerializer,
-    PlaceDetailSerializer,
     PlaceSerializer,
     ReviewSerializer,
     UserRegisterSerializer,
 )
 
 
+def search_places_etag(request, *args, **kwargs):
+    """
+    ETag for conditional search requests.
+
+    Combines the cached place/review write version (a single cache read, no
+    query) with the URL and the negotiated media type, so the JSON and the
+    browsable HTML representations of one URL never share a validator.
+    """
+    fingerprint = json.dumps(
+        [Place.search_version(), request.accepted_media_type, request.get_full_path()]
+    )
+    return hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = UserRegisterSerializer
     permission_classes = [permissions.AllowAny]
@@ -27,8 +46,8 @@ class LoginView(APIView):
         serializer = LoginSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        token, _ = Token.objects.get_or_create(user=user)
-        return Response({"token": token.key})
+        refresh = RefreshToken.for_user(user)
+        return Response({"access": str(refresh.access_token), "refresh": str(refresh)})
 
 
 class AddReviewView(APIView):
@@ -42,20 +61,41 @@ class AddReviewView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
-        place, created = Place.objects.get_or_create(
-            name=data["place_name"].strip(),
-            address=data["place_address"].strip(),
-            defaults={
-                "category": data.get("category") or "other",
-            },
-        )
+        name = data["place_name"].strip()
+        address = data["place_address"].strip()
 
-        review = Review.objects.create(
-            place=place,
-            user=request.user,
-            rating=data["rating"],
-            text=data.get("text", ""),
+        # INSERT ... ON CONFLICT (name, address) DO UPDATE ... RETURNING id:
+        # the unique constraint resolves concurrent creates in one statement.
+        # The no-op update of name makes an existing row return its id.
+        place = Place(
+            name=name,
+            address=address,
+            category=data.get("category") or "other",
         )
+        with transaction.atomic():
+            Place.objects.bulk_create(
+                [place],
+                update_conflicts=True,
+                # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+                unique_fields=(
+                    ["name", "address"]
+                    if connection.features.supports_update_conflicts_with_target
+                    else None
+                ),
+                update_fields=["name"],
+            )
+            if place.pk is None:
+                # Backends that can't return rows from a bulk insert (MySQL)
+                # leave the pk unset; the row exists now, so look it up
+                place.pk = Place.objects.values_list("pk", flat=True).get(
+                    name=name, address=address
+                )
+            review = Review.objects.create(
+                place_id=place.pk,
+                user=request.user,
+                rating=data["rating"],
+                text=data.get("text", ""),
+            )
 
         return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
 
@@ -63,20 +103,28 @@ class AddReviewView(APIView):
 class SearchPlacesView(generics.ListAPIView):
     serializer_class = PlaceSerializer
 
+    # Decorating get() rather than dispatch() keeps the ETag check behind
+    # authentication; unchanged results are answered with 304 Not Modified.
+    @method_decorator(etag(search_places_etag))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         name = self.request.query_params.get("name")
         min_rating = self.request.query_params.get("min_rating")
         category = self.request.query_params.get("category")
 
-        queryset = Place.objects.all().annotate(
-            average_rating=Avg("reviews__rating")
-        )
+        # PlaceSerializer only reads these columns
+        queryset = Place.objects.only("id", "name", "address", "category", "avg_rating")
 
         if min_rating is not None:
             try:
                 min_rating_val = float(min_rating)
-                # Filter by min_rating, excluding places with no reviews (None average_rating)
-                queryset = queryset.filter(average_rating__gte=min_rating_val).exclude(average_rating__isnull=True)
+                # Filter by min_rating, excluding places with no reviews
+                # (their avg_rating defaults to 0.0)
+                queryset = queryset.filter(
+                    review_count__gt=0, avg_rating__gte=min_rating_val
+                )
             except ValueError:
                 pass
 
@@ -99,19 +147,35 @@ class SearchPlacesView(generics.ListAPIView):
 
 
 class PlaceDetailView(generics.RetrieveAPIView):
-    queryset = Place.objects.all().annotate(average_rating=Avg("reviews__rating"))
-    serializer_class = PlaceDetailSerializer
+    queryset = Place.objects.all()
+    serializer_class = PlaceSerializer
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         # Order reviews: current user's review first (if exists), then newest first
-        user_review_q = instance.reviews.filter(user=request.user)
-        other_reviews_q = instance.reviews.exclude(user=request.user)
-
-        ordered_reviews = list(user_review_q.order_by("-created_at")) + list(
-            other_reviews_q.order_by("-created_at")
+        # select_related("user") so ReviewSerializer.user_name doesn't query per
+        # review; only() keeps the join from pulling the rest of the user row
+        reviews = (
+            instance.reviews.select_related("user")
+            .only("id", "place", "rating", "text", "created_at", "user__name")
+            .annotate(
+                is_mine=Case(
+                    When(user=request.user, then=0),
+                    default=1,
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("is_mine", "-created_at")
         )
 
-        place_data = PlaceDetailSerializer(instance).data
-        place_data["reviews"] = ReviewSerializer(ordered_reviews, many=True).data
+        # Reviews are paginated (?limit=&offset=) so large places stay bounded,
+        # and nested under "reviews" in the same envelope the list endpoints use
+        page = self.paginate_queryset(reviews)
+        place_data = self.get_serializer(instance).data
+        place_data["reviews"] = {
+            "count": self.paginator.count,
+            "next": self.paginator.get_next_link(),
+            "previous": self.paginator.get_previous_link(),
+            "results": ReviewSerializer(page, many=True).data,
+        }
         return Response(place_data)
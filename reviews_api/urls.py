@@ -16,6 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import include, path
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from reviews import views as review_views
 
@@ -24,6 +25,7 @@ urlpatterns = [
     # Auth
     path("api/auth/register/", review_views.RegisterView.as_view(), name="register"),
     path("api/auth/login/", review_views.LoginView.as_view(), name="login"),
+    path("api/auth/token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     # Reviews
     path("api/reviews/add/", review_views.AddReviewView.as_view(), name="add-review"),
     # Places search & detail
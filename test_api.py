@@ -4,6 +4,7 @@ Run this after starting the server: python manage.py runserver
 """
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import requests
@@ -13,6 +14,8 @@ except ImportError:
 
 BASE_URL = "http://localhost:8000"
 token = None
+# Created in main(); reusing one session keeps the HTTP connection alive between tests
+session = None
 
 
 def print_test(name):
@@ -31,13 +34,13 @@ def test_register():
         "phone": "9999999999",
         "password": "testpass123"
     }
-    response = requests.post(f"{BASE_URL}/api/auth/register/", json=data)
+    response = session.post(f"{BASE_URL}/api/auth/register/", json=data)
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     assert response.status_code == 201, "Registration should succeed"
     
     # Test 2: Try to register with same phone (should fail)
-    response2 = requests.post(f"{BASE_URL}/api/auth/register/", json=data)
+    response2 = session.post(f"{BASE_URL}/api/auth/register/", json=data)
     print(f"\nDuplicate phone test - Status: {response2.status_code}")
     assert response.status_code in [201, 400], "Duplicate phone should be handled"
     
@@ -49,21 +52,21 @@ def test_login(phone, password):
     print_test("User Login")
     
     data = {"phone": phone, "password": password}
-    response = requests.post(f"{BASE_URL}/api/auth/login/", json=data)
+    response = session.post(f"{BASE_URL}/api/auth/login/", json=data)
     print(f"Status: {response.status_code}")
     result = response.json()
     print(f"Response: {result}")
     assert response.status_code == 200, "Login should succeed"
-    assert "token" in result, "Response should contain token"
+    assert "access" in result, "Response should contain access token"
     
-    return result["token"]
+    return result["access"]
 
 
 def test_add_review(token):
     """Test adding a review"""
     print_test("Add Review")
     
-    headers = {"Authorization": f"Token {token}"}
+    headers = {"Authorization": f"Bearer {token}"}
     data = {
         "place_name": "Test Restaurant",
         "place_address": "123 Test Street",
@@ -71,7 +74,7 @@ def test_add_review(token):
         "text": "Excellent food and service!",
         "category": "restaurant"
     }
-    response = requests.post(f"{BASE_URL}/api/reviews/add/", json=data, headers=headers)
+    response = session.post(f"{BASE_URL}/api/reviews/add/", json=data, headers=headers)
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
     assert response.status_code == 201, "Review should be created"
@@ -83,7 +86,7 @@ def test_add_review(token):
         "rating": 4,
         "text": "Good place"
     }
-    response2 = requests.post(f"{BASE_URL}/api/reviews/add/", json=data2, headers=headers)
+    response2 = session.post(f"{BASE_URL}/api/reviews/add/", json=data2, headers=headers)
     print(f"\nSecond review to same place - Status: {response2.status_code}")
     assert response2.status_code == 201, "Second review should be created"
     
@@ -94,49 +97,37 @@ def test_search_places(token):
     """Test searching places"""
     print_test("Search Places")
     
-    headers = {"Authorization": f"Token {token}"}
+    headers = {"Authorization": f"Bearer {token}"}
+    searches = [
+        ("1. Search by name 'Star':", "name=Star"),
+        ("2. Search by min_rating=4.0:", "min_rating=4.0"),
+        ("3. Search by category='restaurant':", "category=restaurant"),
+        ("4. Combined search (name='Star' AND min_rating=3.0):", "name=Star&min_rating=3.0"),
+    ]
     
-    # Test 1: Search by name
-    print("\n1. Search by name 'Star':")
-    response = requests.get(f"{BASE_URL}/api/places/search/?name=Star", headers=headers)
-    print(f"Status: {response.status_code}")
-    results = response.json()
-    print(f"Results: {json.dumps(results, indent=2)}")
-    assert response.status_code == 200, "Search should succeed"
-    
-    # Test 2: Search by minimum rating
-    print("\n2. Search by min_rating=4.0:")
-    response = requests.get(f"{BASE_URL}/api/places/search/?min_rating=4.0", headers=headers)
-    print(f"Status: {response.status_code}")
-    results = response.json()
-    print(f"Results: {json.dumps(results, indent=2)}")
-    assert response.status_code == 200, "Search should succeed"
+    # The searches are independent, so issue them concurrently over the shared session
+    def search(query):
+        return session.get(f"{BASE_URL}/api/places/search/?{query}", headers=headers)
     
-    # Test 3: Search by category
-    print("\n3. Search by category='restaurant':")
-    response = requests.get(f"{BASE_URL}/api/places/search/?category=restaurant", headers=headers)
-    print(f"Status: {response.status_code}")
-    results = response.json()
-    print(f"Results: {json.dumps(results, indent=2)}")
-    assert response.status_code == 200, "Search should succeed"
+    with ThreadPoolExecutor(max_workers=len(searches)) as executor:
+        responses = list(executor.map(search, [query for _, query in searches]))
     
-    # Test 4: Combined search
-    print("\n4. Combined search (name='Star' AND min_rating=3.0):")
-    response = requests.get(f"{BASE_URL}/api/places/search/?name=Star&min_rating=3.0", headers=headers)
-    print(f"Status: {response.status_code}")
-    results = response.json()
-    print(f"Results: {json.dumps(results, indent=2)}")
-    assert response.status_code == 200, "Search should succeed"
+    for (title, _), response in zip(searches, responses):
+        print(f"\n{title}")
+        print(f"Status: {response.status_code}")
+        results = response.json()
+        print(f"Results: {json.dumps(results, indent=2)}")
+        assert response.status_code == 200, "Search should succeed"
     
-    return results
+    return results["results"]
 
 
 def test_place_detail(token, place_id):
     """Test getting place details"""
     print_test("Place Details")
     
-    headers = {"Authorization": f"Token {token}"}
-    response = requests.get(f"{BASE_URL}/api/places/{place_id}/", headers=headers)
+    headers = {"Authorization": f"Bearer {token}"}
+    response = session.get(f"{BASE_URL}/api/places/{place_id}/", headers=headers)
     print(f"Status: {response.status_code}")
     result = response.json()
     print(f"Response: {json.dumps(result, indent=2)}")
@@ -147,7 +138,7 @@ def test_place_detail(token, place_id):
     assert "reviews" in result, "Should have reviews"
     
     # Verify review ordering: user's review first, then newest first
-    reviews = result["reviews"]
+    reviews = result["reviews"]["results"]
     if reviews:
         print(f"\nReview ordering check:")
         print(f"Total reviews: {len(reviews)}")
@@ -162,7 +153,7 @@ def test_unauthorized_access():
     print_test("Unauthorized Access Test")
     
     # Try to access protected endpoint without token
-    response = requests.get(f"{BASE_URL}/api/places/search/")
+    response = session.get(f"{BASE_URL}/api/places/search/")
     print(f"Status without token: {response.status_code}")
     assert response.status_code == 401, "Should require authentication"
     print("✓ Unauthorized access correctly blocked")
@@ -175,6 +166,9 @@ def main():
     print(f"\nTesting API at: {BASE_URL}")
     print("Make sure the server is running: python manage.py runserver\n")
     
+    global session
+    session = requests.Session()
+    
     try:
         # Test unauthorized access
         test_unauthorized_access()